@@ -0,0 +1,6 @@
+"""
+NEET question tooling: PDF/CSV extraction and local-LLM answer filling.
+
+Kept import-free on purpose; see cli.py. Run as:
+  python3 -m neet_tools {extract,parse-kaggle,answer,index} [args]
+"""
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Fill multiple-choice answers using a LOCAL LLM via Ollama.
+
+- Input CSV must have at least:
+    stem            : question text
+    options         : JSON array of 4 strings (choices)
+  (Optionally already has: correct_index, explanation)
+
+- Output CSV defaults to <input>.answered.csv. Existing correct_index values are left untouched unless --overwrite is used.
+
+Examples:
+  python3 -m neet_tools answer questions.csv
+  python3 -m neet_tools answer questions.csv --model mistral --self-consistency 3 --write-explanations
+  python3 -m neet_tools answer questions.csv --start 0 --end 2000 --checkpoint-every 200
+  python3 -m neet_tools answer questions.csv --shuffle-options 4   # debias option position
+  python3 -m neet_tools answer questions.csv --metrics-prom run.prom --metrics-jsonl run.jsonl
+  python3 -m neet_tools answer questions.csv --model phi3:mini --self-consistency 3 \
+      --cascade-model llama3:70b --escalate-below 0.67            # small first, big on doubt
+  python3 -m neet_tools answer questions.csv --index qindex --few-shot 3   # see neet_tools index --help
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from .llm_metrics import RunMetrics
+
+# pandas / tqdm / ollama (and numpy via question_index) are imported inside
+# the functions that need them so `--help` and dry paths start instantly.
+
+LETTER_TO_IDX = {"A": 0, "B": 1, "C": 2, "D": 3}
+IDX_TO_LETTER = {v: k for k, v in LETTER_TO_IDX.items()}
+
+# Shared by every ask_* call (including pool threads); see llm_metrics.py
+METRICS = RunMetrics()
+
+
+PROMPT_TEMPLATE = """You are a careful exam solver. Choose the single best answer.
+
+Question:
+{stem}
+
+Options:
+A. {a}
+B. {b}
+C. {c}
+D. {d}
+
+Rules:
+- Think briefly.
+- Return ONLY one letter: A, B, C, or D.
+"""
+
+PROMPT_WITH_EXPLANATION = """You are a careful exam solver. Choose the single best answer and justify briefly.
+
+Question:
+{stem}
+
+Options:
+A. {a}
+B. {b}
+C. {c}
+D. {d}
+
+Return JSON exactly like:
+{{"answer":"A","why":"one or two concise sentences"}}
+"""
+
+def ask_once(model: str, prompt: str, temperature: float) -> str:
+    """Call Ollama once and return raw text."""
+    import ollama
+
+    METRICS.request_started()
+    resp = None
+    t0 = time.perf_counter()
+    try:
+        resp = ollama.chat(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            options={"temperature": temperature},
+        )
+    finally:
+        METRICS.request_finished(model, time.perf_counter() - t0, resp)
+    return (resp.get("message", {}) or {}).get("content", "").strip()
+
+
+def parse_letter(text: str) -> str:
+    """
+    Extract A/B/C/D robustly from model output.
+    Accepts: 'A', 'Answer: B', 'I think (C)', 'Option D is correct', etc.
+    """
+    # JSON case from explanation mode
+    try:
+        j = json.loads(text)
+        if isinstance(j, dict) and "answer" in j:
+            cand = j["answer"].strip().upper()
+            if cand in LETTER_TO_IDX:
+                return cand
+    except Exception:
+        pass
+
+    # General patterns
+    m = re.search(r"\b([ABCD])\b", text.upper())
+    if m:
+        return m.group(1)
+
+    # Sometimes models write "Option A" or similar
+    m = re.search(r"\bOPTION\s*([ABCD])\b", text.upper())
+    if m:
+        return m.group(1)
+
+    # Last resort: look for words like "(a)" or "choice c"
+    m = re.search(r"\b(?:CHOICE|ANSWER)\s*([ABCD])\b", text.upper())
+    if m:
+        return m.group(1)
+
+    return ""
+
+
+def majority_letter(votes: list, asked: int, tie_undecided: bool = False) -> (str, float):
+    """
+    Most common letter among votes ('' if there are none) and its share of
+    all `asked` calls, so unparseable replies count against confidence.
+    Ties go to the first-voted letter unless tie_undecided, which returns ''
+    instead (ask_permuted: the first votes are the original order, so
+    preferring them would reintroduce the position bias).
+    """
+    if not votes:
+        return "", 0.0
+    top = Counter(votes).most_common(2)
+    n = top[0][1]
+    if tie_undecided and len(top) > 1 and top[1][1] == n:
+        return "", n / max(asked, 1)
+    return top[0][0], n / max(asked, 1)
+
+
+def ask_majority(model: str, prompt: str, temperature: float, k: int) -> (str, str, float):
+    """
+    Query the model k times and take majority vote on letter.
+    Returns (letter, raw_concat_text, vote_share)
+    """
+    votes = []
+    raws = []
+    for _ in range(k):
+        out = ask_once(model, prompt, temperature)
+        raws.append(out)
+        letter = parse_letter(out)
+        METRICS.parsed(model, bool(letter))
+        if letter:
+            votes.append(letter)
+    letter, share = majority_letter(votes, k)
+    return letter, "\n---\n".join(raws), share
+
+
+def option_permutations(n: int, seed: int = 0) -> list:
+    """
+    n orderings of the 4 options, identity first.
+    Up to 4 we use cyclic rotations so every option visits every slot once;
+    beyond that, distinct random permutations (deterministic per seed).
+    """
+    n = max(1, min(n, 24))
+    perms = [tuple((s + j) % 4 for j in range(4)) for s in range(min(n, 4))]
+    if n > 4:
+        rest = [p for p in itertools.permutations(range(4)) if p not in perms]
+        random.Random(seed).shuffle(rest)
+        perms += rest[: n - 4]
+    return perms
+
+
+def ask_permuted(model: str, template: str, stem: str, options: list,
+                 temperature: float, k: int, perms: list,
+                 pool: Optional[ThreadPoolExecutor] = None) -> (str, str, float):
+    """
+    Ask the question once per option ordering (k samples each), map every
+    answer back to the ORIGINAL letter and majority-vote as ask_majority does,
+    except that a tie is reported as undecided ('').
+    The len(perms) * k calls go through `pool` (shared across rows and sized
+    by --parallel), so with a server that allows that many parallel requests
+    (OLLAMA_NUM_PARALLEL) a row costs about one round-trip of latency.
+    Without a pool they run sequentially. Raw outputs are returned
+    identity-order first.
+    """
+    jobs = [p for p in perms for _ in range(k)]
+    prompts = []
+    for p in jobs:
+        a, b, c, d = [options[j] for j in p]
+        prompts.append(template.format(stem=stem, a=a, b=b, c=c, d=d))
+
+    run = pool.map if pool is not None else map
+    raws = list(run(lambda pr: ask_once(model, pr, temperature), prompts))
+
+    votes = []
+    for p, out in zip(jobs, raws):
+        letter = parse_letter(out)
+        METRICS.parsed(model, bool(letter))
+        if letter:
+            # slot LETTER_TO_IDX[letter] showed original option p[slot]
+            votes.append(IDX_TO_LETTER[p[LETTER_TO_IDX[letter]]])
+    letter, share = majority_letter(votes, len(jobs), tie_undecided=True)
+    return letter, "\n---\n".join(raws), share
+
+
+def cascade(ask_small, ask_big, escalate_below: float) -> (str, str, float, bool):
+    """
+    Answer with ask_small(); if it is undecided or its vote share is below
+    escalate_below, re-ask with ask_big (skipped when None). Both callables
+    return (letter, raw, share). The small model's pick is kept when the big
+    one is unparseable too. Returns (letter, raw, share, escalated).
+    """
+    letter, raw, share = ask_small()
+    if ask_big is None or (letter and share >= escalate_below):
+        return letter, raw, share, False
+    big_letter, big_raw, big_share = ask_big()
+    if big_letter:
+        return big_letter, big_raw, big_share, True
+    return letter, raw, share, True
+
+
+def row_options(row):
+    """The row's 4 options as stripped strings, or None if malformed."""
+    try:
+        options = row["options"]
+        if isinstance(options, str):
+            options = json.loads(options)
+        assert isinstance(options, (list, tuple)) and len(options) == 4
+    except Exception:
+        return None
+    return [str(x).strip() for x in options]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="neet_tools answer", description="Fill correct_index with a local Ollama model")
+    ap.add_argument("input_csv", type=Path, help="Input CSV with columns: stem, options (JSON array of 4 strings)")
+    ap.add_argument("--output", type=Path, help="Output CSV (default: <input>.answered.csv)")
+    ap.add_argument("--model", default="mistral", help="Ollama model name (e.g., mistral, llama3:8b)")
+    ap.add_argument("--cascade-model", default=None,
+                    help="Larger model that re-answers rows --model is unsure about (enables cascade mode)")
+    ap.add_argument("--escalate-below", type=float, default=1.0,
+                    help="Escalate when the winning vote share is below this (1.0 = any split or parse failure)")
+    ap.add_argument("--temperature", type=float, default=0.1, help="Sampling temperature")
+    ap.add_argument("--self-consistency", type=int, default=1, help="Ask k times and majority vote")
+    ap.add_argument("--shuffle-options", type=int, default=1,
+                    help="Ask under N option orders (rotations first) and vote, to cancel position bias; 1 = off")
+    ap.add_argument("--shuffle-seed", type=int, default=0, help="Seed for orders beyond the 4 rotations")
+    ap.add_argument("--parallel", type=int, default=4,
+                    help="Max concurrent Ollama requests for --shuffle-options (match OLLAMA_NUM_PARALLEL)")
+    ap.add_argument("--start", type=int, default=0, help="Start row (inclusive)")
+    ap.add_argument("--end", type=int, default=None, help="End row (exclusive)")
+    ap.add_argument("--overwrite", action="store_true", help="Overwrite existing correct_index values")
+    ap.add_argument("--write-explanations", action="store_true", help="Also write explanation JSON (key: text)")
+    ap.add_argument("--checkpoint-every", type=int, default=500, help="Save interim CSV every N rows")
+    ap.add_argument("--index", type=Path, default=None,
+                    help="Solved-question index dir (neet_tools index build) for reuse and few-shot")
+    ap.add_argument("--few-shot", type=int, default=3, help="Nearest solved questions to show as examples")
+    ap.add_argument("--few-shot-min-sim", type=float, default=0.7,
+                    help="Only show examples at least this cosine-similar (unrelated ones just add tokens)")
+    ap.add_argument("--reuse-threshold", type=float, default=0.97,
+                    help="Cosine at/above which a neighbour with the same options donates its answer (>1 = never)")
+    ap.add_argument("--metrics-prom", default=None, help="Rewrite Prometheus-format metrics to this file")
+    ap.add_argument("--metrics-jsonl", default=None, help="Append JSON metrics snapshots to this file")
+    ap.add_argument("--metrics-every", type=float, default=15.0, help="Seconds between metrics exports")
+    args = ap.parse_args(argv)
+
+    import pandas as pd
+    from tqdm import tqdm
+
+    src = args.input_csv
+    out = args.output or src.with_suffix(".answered.csv")
+
+    df = pd.read_csv(src)
+    required_cols = {"stem", "options"}
+    missing = required_cols - set(df.columns)
+    if missing:
+        raise SystemExit(f"Missing required columns: {missing}")
+
+    # Prepare output columns
+    if "correct_index" not in df.columns:
+        df["correct_index"] = pd.NA
+    if args.write_explanations and "explanation" not in df.columns:
+        df["explanation"] = ""
+
+    start = max(0, args.start)
+    end = len(df) if args.end is None else min(args.end, len(df))
+
+    print(f"Model: {args.model}")
+    if args.cascade_model:
+        print(f"Cascade: escalate to {args.cascade_model} when vote share < {args.escalate_below}")
+    print(f"Rows: {start}..{end} of {len(df)}")
+    print(f"Self-consistency: {args.self_consistency}  |  Temperature: {args.temperature}")
+    perms = option_permutations(args.shuffle_options, args.shuffle_seed)
+    if len(perms) > 1:
+        print(f"Option shuffles: {len(perms)} orders × {args.self_consistency} "
+              f"(up to {args.parallel} concurrent)")
+    pool = ThreadPoolExecutor(max_workers=max(1, args.parallel)) if len(perms) > 1 else None
+    print(f"Writing explanations: {args.write_explanations}")
+    print(f"Output: {out}")
+
+    # Rows that will actually be sent to a model (or answered from the index)
+    todo = []
+    for i in range(start, end):
+        row = df.iloc[i]
+        if not args.overwrite and pd.notna(row.get("correct_index")):
+            continue
+        options = row_options(row)
+        if options is not None:
+            todo.append((i, str(row["stem"]).strip(), options))
+    METRICS.queue_rows(len(todo))
+
+    # Retrieve neighbours for every row we will answer up front: embedding
+    # and searching in batches is far cheaper than one query per row.
+    hits_by_row = {}
+    if args.index:
+        from .question_index import QuestionIndex, few_shot_block, reuse_answer
+
+        index = QuestionIndex(args.index)
+        print(f"Index: {index.count} solved rows ({index.model}); retrieving for {len(todo)} rows")
+        k = max(args.few_shot, 1)
+        for lo in range(0, len(todo), 256):
+            batch = todo[lo:lo + 256]
+            # under --overwrite a row may sit in the index itself; skip only that entry
+            origins = [(str(src.resolve()), i) for i, _, _ in batch] if args.overwrite else None
+            found = index.neighbours([(st, op) for _, st, op in batch], k, origins)
+            for (i, _, _), hits in zip(batch, found):
+                hits_by_row[i] = hits
+
+    processed = 0
+    METRICS.start_exporter(args.metrics_every, args.metrics_prom, args.metrics_jsonl)
+    bar = tqdm(range(start, end), total=end - start, desc="Answering")
+    for i in bar:
+        row = df.iloc[i]
+
+        # Skip if already answered and not overwriting
+        if not args.overwrite and pd.notna(row.get("correct_index")):
+            continue
+
+        # Load options JSON safely
+        options = row_options(row)
+        if options is None:
+            # Can't answer if options are malformed
+            continue
+
+        stem = str(row["stem"]).strip()
+        a, b, c, d = options
+        template = PROMPT_WITH_EXPLANATION if args.write_explanations else PROMPT_TEMPLATE
+        hits = hits_by_row.get(i, [])
+        shots = [h for h in hits[:args.few_shot] if h[1] >= args.few_shot_min_sim]
+        if shots:
+            block = few_shot_block(shots, json_answers=args.write_explanations)
+            template = block.replace("{", "{{").replace("}", "}}") + template
+
+        def ask(model, tier):
+            t0 = time.perf_counter()
+            if len(perms) > 1:
+                res = ask_permuted(model, template, stem, options,
+                                   args.temperature, args.self_consistency, perms, pool)
+            else:
+                prompt = template.format(stem=stem, a=a, b=b, c=c, d=d)
+                res = ask_majority(model, prompt, args.temperature, args.self_consistency)
+            METRICS.tier_row(tier, time.perf_counter() - t0)
+            return res
+
+        reused = None
+        if hits and hits[0][1] >= args.reuse_threshold:
+            reused = reuse_answer(stem, options, hits[0][0])
+
+        if reused is not None:
+            # near-duplicate of a solved question: no model call at all
+            letter, raw, share = IDX_TO_LETTER[reused], "", 1.0
+            METRICS.tier_row("index", 0.0)
+        else:
+            ask_big = (lambda: ask(args.cascade_model, "big")) if args.cascade_model else None
+            letter, raw, share, _ = cascade(lambda: ask(args.model, "small"), ask_big,
+                                            args.escalate_below)
+
+        if args.write_explanations and reused is None:
+            # Try to pull "why" if JSON, else keep raw as explanation
+            # (first raw is always the original option order)
+            exp_text = ""
+            try:
+                j = json.loads(raw.split("\n---\n")[0])
+                if isinstance(j, dict) and "why" in j:
+                    exp_text = j["why"]
+            except Exception:
+                exp_text = raw
+            df.at[i, "explanation"] = json.dumps({"text": str(exp_text)[:2000]})
+
+        if letter in LETTER_TO_IDX:
+            df.at[i, "correct_index"] = LETTER_TO_IDX[letter]
+        else:
+            # Leave as NaN if the model failed to decide
+            pass
+
+        processed += 1
+        METRICS.row_done()
+        bar.set_postfix(METRICS.postfix(), refresh=False)
+        if processed and args.checkpoint_every and (processed % args.checkpoint_every == 0):
+            df.to_csv(out, index=False)
+
+    if pool is not None:
+        pool.shutdown()
+    df.to_csv(out, index=False)
+    METRICS.stop_exporter()
+    METRICS.export(args.metrics_prom, args.metrics_jsonl)
+    METRICS.print_summary()
+    if args.cascade_model:
+        METRICS.print_cascade(args.model, args.cascade_model)
+    if args.index:
+        print(f"Reused from index: {METRICS.tiers.get('index', [0])[0]} rows")
+    print(f"Done. Wrote: {out}")
+    answered = df["correct_index"].notna().sum()
+    print(f"Answered rows: {answered} / {len(df)}")
+
+
+if __name__ == "__main__":
+    main()
+
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark text_normalize.normalize_text against the old whitespace-only cleanup.
+
+Builds ~N MB of realistic text by repeating failed_blocks.txt (raw PDF
+blocks) and reports throughput plus the extra cost per MB.
+
+Usage:
+  python3 -m neet_tools.bench_normalize
+  python3 -m neet_tools.bench_normalize --mb 8 --repeat 5 --sample failed_blocks.txt
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+from .text_normalize import normalize_text
+
+
+def legacy_clean(text: str) -> str:
+    """The pre-normalizer extractor cleanup, kept as the baseline."""
+    text = text.replace("\r", "\n")
+    text = re.sub(r"[ \t]+", " ", text)
+    return text.replace("–", "-").replace("—", "-")
+
+
+def best_of(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    here = Path(__file__).resolve().parent.parent  # scripts/, next to failed_blocks.txt
+    ap = argparse.ArgumentParser(description="normalize_text throughput benchmark")
+    ap.add_argument("--sample", type=Path, default=here / "failed_blocks.txt", help="Seed text file")
+    ap.add_argument("--mb", type=float, default=4.0, help="Approximate corpus size in MB")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs (best is reported)")
+    args = ap.parse_args()
+
+    seed = args.sample.read_text(encoding="utf-8", errors="replace")
+    reps = max(1, int(args.mb * 1024 * 1024 / max(1, len(seed.encode("utf-8")))))
+    text = seed * reps
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+
+    base = best_of(legacy_clean, text, args.repeat)
+    full = best_of(normalize_text, text, args.repeat)
+    flat = best_of(lambda t: normalize_text(t, keep_newlines=False), text, args.repeat)
+
+    print(f"Corpus: {size_mb:.2f} MB ({reps}× {args.sample.name})")
+    print(f"  legacy clean_text      : {base * 1000:8.1f} ms  ({size_mb / base:7.1f} MB/s)")
+    print(f"  normalize_text         : {full * 1000:8.1f} ms  ({size_mb / full:7.1f} MB/s)")
+    print(f"  normalize_text (flat)  : {flat * 1000:8.1f} ms  ({size_mb / flat:7.1f} MB/s)")
+    print(f"  overhead vs legacy     : {(full - base) * 1000 / size_mb:8.1f} ms per MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Cold-start budget check for the neet_tools CLI.
+
+For each command it runs `python -X importtime -m neet_tools <cmd> --help`
+in a fresh interpreter and reports:
+- wall time from spawn to exit (what a CI smoke check or quick loop pays)
+- cumulative import time of neet_tools and of its heavy deps, parsed from
+  the -X importtime log (heavy deps must not appear at all)
+
+Exits non-zero if any command is over --budget-ms or imports a heavy dep,
+so it can run in CI.
+
+Usage:
+  python3 -m neet_tools.bench_startup
+  python3 -m neet_tools.bench_startup --budget-ms 300 --runs 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HEAVY = ("pandas", "numpy", "pdfplumber", "ollama", "tqdm", "httpx")
+COMMANDS = ([], ["extract"], ["parse-kaggle"], ["answer"], ["index"])
+
+
+def importtimes(stderr: str) -> dict:
+    """Top-level package -> cumulative µs, from -X importtime output."""
+    out = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, raw_name = line[len("import time:"):].split("|")
+        cumulative = cumulative.strip()
+        if not cumulative.isdigit():
+            continue  # header row
+        # importtime indents nested imports by two spaces per level after
+        # the "| "; only top-level entries are summed, so a package and its
+        # submodules are not counted twice
+        if raw_name[1:2] == " ":
+            continue
+        name = raw_name.strip().split(".")[0]
+        out[name] = out.get(name, 0) + int(cumulative)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="neet_tools cold-start budget")
+    ap.add_argument("--budget-ms", type=float, default=300.0, help="Max wall ms per --help invocation")
+    ap.add_argument("--runs", type=int, default=3, help="Runs per command (best is reported)")
+    args = ap.parse_args()
+
+    scripts_dir = Path(__file__).resolve().parent.parent
+    env = dict(os.environ, PYTHONPATH=str(scripts_dir), PYTHONDONTWRITEBYTECODE="")
+    failed = False
+    for cmd in COMMANDS:
+        argv = [sys.executable, "-X", "importtime", "-m", "neet_tools", *cmd, "--help"]
+        best, imports = float("inf"), {}
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            proc = subprocess.run(argv, env=env, capture_output=True, text=True)
+            wall = (time.perf_counter() - t0) * 1000
+            if wall < best:
+                best, imports = wall, importtimes(proc.stderr)
+        heavy = sorted(h for h in HEAVY if h in imports)
+        own = imports.get("neet_tools", 0) / 1000
+        ok = best <= args.budget_ms and not heavy
+        failed |= not ok
+        label = " ".join(cmd) or "(none)"
+        print(f"{'ok ' if ok else 'FAIL'} {label:<13} wall {best:6.1f} ms  neet_tools imports {own:5.1f} ms"
+              + (f"  heavy: {', '.join(heavy)}" if heavy else ""))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the NEET scripts.
+
+  python3 -m neet_tools extract       PDFs → questions CSV
+  python3 -m neet_tools parse-kaggle  Kaggle eng/Subject CSV → questions CSV
+  python3 -m neet_tools answer        fill correct_index with a local Ollama model
+  python3 -m neet_tools index         build/query the solved-question index
+
+Dispatch is by name: only the chosen subcommand's module is imported, and
+those modules import pandas/pdfplumber/ollama/numpy lazily, so `--help`
+and argument errors return in well under the budget checked by
+`python3 -m neet_tools.bench_startup`.
+"""
+
+from __future__ import annotations
+import sys
+
+# subcommand -> (module, one-line help)
+COMMANDS = {
+    "extract": ("neet_tools.extract", "NEET PDF → CSV extractor"),
+    "parse-kaggle": ("neet_tools.parse_kaggle", "Kaggle eng/Subject CSV → questions CSV"),
+    "answer": ("neet_tools.answer", "Fill correct_index with a local Ollama model"),
+    "index": ("neet_tools.question_index", "Build/query the solved-question embedding index"),
+}
+
+
+def usage() -> str:
+    lines = ["usage: python3 -m neet_tools <command> [args]", "", "commands:"]
+    lines += [f"  {name:<13} {help_}" for name, (_, help_) in COMMANDS.items()]
+    lines += ["", "Run `python3 -m neet_tools <command> --help` for command options."]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+    cmd, rest = argv[0], argv[1:]
+    if cmd not in COMMANDS:
+        print(f"unknown command: {cmd}\n\n{usage()}", file=sys.stderr)
+        return 2
+    # __import__ (not importlib.import_module) so the import goes through
+    # the C import path and shows up under -X importtime
+    name = COMMANDS[cmd][0]
+    __import__(name)
+    module = sys.modules[name]
+    module.main(rest)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
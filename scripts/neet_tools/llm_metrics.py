@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Throughput/latency telemetry for `neet_tools answer` runs.
+
+Collects, per model:
+- request latency histogram (fixed log-ish buckets → p50/p95/p99)
+- generated tokens and generation time from Ollama's eval_count /
+  eval_duration, i.e. decode tokens/sec
+- parse_letter success/failure counts
+Plus run-level gauges: in-flight requests (current and peak since the
+last export), rows still queued for an answer, and per-tier row
+counts/time for cascade runs (small model → big model).
+
+Everything is thread-safe (ask_permuted fans out on a thread pool) and
+O(buckets) to read, so a live tqdm postfix costs nothing.
+
+Exports (periodically from a daemon thread, see start_exporter, so the
+gauges are sampled mid-request and not only between rows):
+- Prometheus text format (atomic rewrite; point node_exporter's textfile
+  collector at it)
+- JSONL: one snapshot object per line, appended
+"""
+
+from __future__ import annotations
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+# Upper bounds in seconds; local 7B–70B models on shared boxes span ~0.1s–5min,
+# small models on a warm GPU answer a one-letter prompt in ~10ms.
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300, math.inf)
+
+
+class _ModelStats:
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.seconds = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.errors = 0
+        self.eval_tokens = 0
+        self.eval_seconds = 0.0
+        self.prompt_tokens = 0
+        self.parse_ok = 0
+        self.parse_fail = 0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a latency quantile by interpolating inside its bucket, with
+        the bucket edges narrowed to the observed min/max so a run of 10ms
+        requests does not report p50 = half the first bucket.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for upper, n in zip(BUCKETS, self.buckets):
+            if n and seen + n >= rank:
+                lo, hi = max(lower, self.min), min(upper, self.max)
+                return lo + (hi - lo) * (rank - seen) / n
+            seen += n
+            lower = upper
+        return self.max
+
+    def tokens_per_sec(self) -> float:
+        return self.eval_tokens / self.eval_seconds if self.eval_seconds else 0.0
+
+    def parse_fail_rate(self) -> float:
+        total = self.parse_ok + self.parse_fail
+        return self.parse_fail / total if total else 0.0
+
+
+class RunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.models: Dict[str, _ModelStats] = {}
+        self.inflight = 0
+        self.inflight_peak = 0  # since the last export
+        self.rows_pending = 0
+        self.rows_done = 0
+        self.tiers: Dict[str, list] = {}  # "small" / "big" / "index" -> [rows, seconds]
+        self.started = time.time()
+        self._exporter = None
+
+    def _stats(self, model: str) -> _ModelStats:
+        st = self.models.get(model)
+        if st is None:
+            st = self.models[model] = _ModelStats()
+        return st
+
+    # ---------- recording ---------- #
+    def request_started(self) -> None:
+        with self._lock:
+            self.inflight += 1
+            self.inflight_peak = max(self.inflight_peak, self.inflight)
+
+    def request_finished(self, model: str, seconds: float, resp=None) -> None:
+        """resp is the raw ollama.chat response (None if the call raised)."""
+        with self._lock:
+            self.inflight -= 1
+            st = self._stats(model)
+            st.count += 1
+            st.seconds += seconds
+            st.min = min(st.min, seconds)
+            st.max = max(st.max, seconds)
+            for i, upper in enumerate(BUCKETS):
+                if seconds <= upper:
+                    st.buckets[i] += 1
+                    break
+            if resp is None:
+                st.errors += 1
+                return
+            st.eval_tokens += resp.get("eval_count") or 0
+            st.eval_seconds += (resp.get("eval_duration") or 0) / 1e9
+            st.prompt_tokens += resp.get("prompt_eval_count") or 0
+
+    def parsed(self, model: str, ok: bool) -> None:
+        with self._lock:
+            st = self._stats(model)
+            if ok:
+                st.parse_ok += 1
+            else:
+                st.parse_fail += 1
+
+    def tier_row(self, tier_name: str, seconds: float) -> None:
+        """
+        One row answered (all votes) by a cascade tier, taking `seconds` wall
+        time. Tiers are roles, not model names, so --model and --cascade-model
+        naming the same model still count separately.
+        """
+        with self._lock:
+            tier = self.tiers.setdefault(tier_name, [0, 0.0])
+            tier[0] += 1
+            tier[1] += seconds
+
+    def queue_rows(self, n: int) -> None:
+        """`n` rows actually need an answer (already-answered rows excluded)."""
+        with self._lock:
+            self.rows_pending = n
+
+    def row_done(self) -> None:
+        with self._lock:
+            self.rows_done += 1
+            self.rows_pending = max(self.rows_pending - 1, 0)
+
+    # ---------- reading ---------- #
+    def _total(self) -> _ModelStats:
+        tot = _ModelStats()
+        for st in self.models.values():
+            tot.buckets = [a + b for a, b in zip(tot.buckets, st.buckets)]
+            for k in ("count", "seconds", "errors", "eval_tokens", "eval_seconds",
+                      "prompt_tokens", "parse_ok", "parse_fail"):
+                setattr(tot, k, getattr(tot, k) + getattr(st, k))
+            tot.min = min(tot.min, st.min)
+            tot.max = max(tot.max, st.max)
+        return tot
+
+    def postfix(self) -> dict:
+        """Compact live view for tqdm.set_postfix."""
+        with self._lock:
+            tot = self._total()
+            return {
+                "p50": f"{tot.quantile(0.5):.1f}s",
+                "p95": f"{tot.quantile(0.95):.1f}s",
+                "tok/s": f"{tot.tokens_per_sec():.0f}",
+                "fail": f"{tot.parse_fail_rate():.1%}",
+                "q": self.rows_pending,
+            }
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.time()
+            elapsed = now - self.started
+            models = {}
+            for name, st in self.models.items():
+                models[name] = {
+                    "requests": st.count,
+                    "errors": st.errors,
+                    "p50_s": round(st.quantile(0.5), 3),
+                    "p95_s": round(st.quantile(0.95), 3),
+                    "p99_s": round(st.quantile(0.99), 3),
+                    "mean_s": round(st.seconds / st.count, 3) if st.count else 0.0,
+                    "eval_tokens": st.eval_tokens,
+                    "prompt_tokens": st.prompt_tokens,
+                    "tokens_per_sec": round(st.tokens_per_sec(), 2),
+                    "parse_ok": st.parse_ok,
+                    "parse_fail": st.parse_fail,
+                    "parse_fail_rate": round(st.parse_fail_rate(), 4),
+                }
+            return {
+                "ts": round(now, 3),
+                "elapsed_s": round(elapsed, 1),
+                "rows_done": self.rows_done,
+                "rows_pending": self.rows_pending,
+                "rows_per_min": round(self.rows_done * 60 / elapsed, 2) if elapsed else 0.0,
+                "inflight": self.inflight,
+                "inflight_peak": self.inflight_peak,
+                "tiers": {t: {"rows": r, "seconds": round(sec, 2)} for t, (r, sec) in self.tiers.items()},
+                "models": models,
+            }
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP neet_llm_request_seconds Ollama chat request latency.",
+                "# TYPE neet_llm_request_seconds histogram",
+            ]
+            for name, st in self.models.items():
+                lab = f'model="{name}"'
+                cum = 0
+                for upper, n in zip(BUCKETS, st.buckets):
+                    cum += n
+                    le = "+Inf" if math.isinf(upper) else f"{upper:g}"
+                    lines.append(f'neet_llm_request_seconds_bucket{{{lab},le="{le}"}} {cum}')
+                lines.append(f"neet_llm_request_seconds_sum{{{lab}}} {st.seconds:.6f}")
+                lines.append(f"neet_llm_request_seconds_count{{{lab}}} {st.count}")
+
+            def family(metric, kind, help_, rows):
+                lines.append(f"# HELP {metric} {help_}")
+                lines.append(f"# TYPE {metric} {kind}")
+                lines.extend(f"{metric}{{{lab}}} {val}" for lab, val in rows)
+
+            per = list(self.models.items())
+            family("neet_llm_request_quantile_seconds", "gauge", "Estimated latency quantiles.",
+                   [(f'model="{m}",quantile="{q}"', f"{st.quantile(q):.4f}")
+                    for m, st in per for q in (0.5, 0.95, 0.99)])
+            family("neet_llm_request_errors_total", "counter", "Requests that raised.",
+                   [(f'model="{m}"', st.errors) for m, st in per])
+            family("neet_llm_eval_tokens_total", "counter", "Generated tokens (eval_count).",
+                   [(f'model="{m}"', st.eval_tokens) for m, st in per])
+            family("neet_llm_prompt_tokens_total", "counter", "Prompt tokens (prompt_eval_count).",
+                   [(f'model="{m}"', st.prompt_tokens) for m, st in per])
+            family("neet_llm_tokens_per_second", "gauge", "Decode throughput (eval_count / eval_duration).",
+                   [(f'model="{m}"', f"{st.tokens_per_sec():.3f}") for m, st in per])
+            family("neet_llm_parse_total", "counter", "parse_letter outcomes.",
+                   [(f'model="{m}",result="{r}"', n) for m, st in per
+                    for r, n in (("ok", st.parse_ok), ("fail", st.parse_fail))])
+            family("neet_llm_tier_rows_total", "counter", "Rows answered per cascade tier.",
+                   [(f'tier="{t}"', r) for t, (r, _) in self.tiers.items()])
+            family("neet_llm_tier_seconds_total", "counter", "Wall time spent per cascade tier.",
+                   [(f'tier="{t}"', f"{sec:.3f}") for t, (_, sec) in self.tiers.items()])
+            lines.append("# HELP neet_llm_inflight_requests Requests currently waiting on Ollama.")
+            lines.append("# TYPE neet_llm_inflight_requests gauge")
+            lines.append(f"neet_llm_inflight_requests {self.inflight}")
+            lines.append("# HELP neet_llm_inflight_requests_peak Max concurrent requests since the previous export.")
+            lines.append("# TYPE neet_llm_inflight_requests_peak gauge")
+            lines.append(f"neet_llm_inflight_requests_peak {self.inflight_peak}")
+            lines.append("# HELP neet_llm_rows_pending Rows still waiting for an answer.")
+            lines.append("# TYPE neet_llm_rows_pending gauge")
+            lines.append(f"neet_llm_rows_pending {self.rows_pending}")
+            lines.append("# HELP neet_llm_rows_done_total Rows processed so far.")
+            lines.append("# TYPE neet_llm_rows_done_total counter")
+            lines.append(f"neet_llm_rows_done_total {self.rows_done}")
+            return "\n".join(lines) + "\n"
+
+    # ---------- export ---------- #
+    def export(self, prom_path: Optional[str] = None, jsonl_path: Optional[str] = None) -> None:
+        if prom_path:
+            tmp = f"{prom_path}.tmp"
+            with open(tmp, "w") as fh:
+                fh.write(self.to_prometheus())
+            os.replace(tmp, prom_path)  # scrapers never see a half-written file
+        if jsonl_path:
+            with open(jsonl_path, "a") as fh:
+                fh.write(json.dumps(self.snapshot()) + "\n")
+        with self._lock:
+            self.inflight_peak = self.inflight
+
+    def start_exporter(self, every: float, prom_path: Optional[str] = None,
+                       jsonl_path: Optional[str] = None) -> None:
+        """Call export() every `every` seconds from a daemon thread until stop_exporter()."""
+        if not (prom_path or jsonl_path) or self._exporter:
+            return
+        stop = threading.Event()
+
+        def loop():
+            while not stop.wait(every):
+                self.export(prom_path, jsonl_path)
+
+        thread = threading.Thread(target=loop, name="metrics-export", daemon=True)
+        thread.start()
+        self._exporter = (stop, thread)
+
+    def stop_exporter(self) -> None:
+        if self._exporter:
+            stop, thread = self._exporter
+            stop.set()
+            thread.join()  # never race the final export on the .tmp file
+            self._exporter = None
+
+    def print_summary(self) -> None:
+        snap = self.snapshot()
+        print(f"\nTelemetry ({snap['elapsed_s']:.0f}s, {snap['rows_per_min']} rows/min):")
+        for name, m in snap["models"].items():
+            print(f"  {name}: {m['requests']} req  p50 {m['p50_s']}s  p95 {m['p95_s']}s  "
+                  f"p99 {m['p99_s']}s  {m['tokens_per_sec']} tok/s  "
+                  f"parse-fail {m['parse_fail_rate']:.1%}  errors {m['errors']}")
+
+    def print_cascade(self, small: str, big: str) -> None:
+        """Rows per tier and estimated time saved versus running `big` on every row."""
+        with self._lock:
+            s_rows, s_sec = self.tiers.get("small", (0, 0.0))
+            b_rows, b_sec = self.tiers.get("big", (0, 0.0))
+        print("\nCascade:")
+        print(f"  small ({small}): {s_rows} rows ({s_sec:.0f}s)")
+        print(f"  big ({big}): {b_rows} escalated rows ({b_sec:.0f}s)"
+              + (f", {b_rows / s_rows:.1%} of rows" if s_rows else ""))
+        est = cascade_savings(s_rows, s_sec, b_rows, b_sec)
+        if est is None:
+            print("  time saved vs big-only: n/a (nothing escalated to measure)")
+            return
+        all_big, saved = est
+        print(f"  est. big-only: {all_big:.0f}s  actual: {s_sec + b_sec:.0f}s  "
+              f"saved: {saved:.0f}s ({saved / all_big:.0%})")
+        print("  (big-only time is extrapolated from the escalated rows, which are the"
+              " hardest ones, so it likely overestimates and so does the saving)")
+
+
+def cascade_savings(s_rows: int, s_sec: float, b_rows: int, b_sec: float) -> Optional[tuple]:
+    """
+    (estimated big-only seconds, seconds saved) for a cascade where the small
+    tier saw s_rows rows and b_rows of them were escalated, or None if nothing
+    was escalated. Big-only time is the big tier's mean per escalated row
+    times s_rows: escalated rows are the ones the small model found hard, so
+    if the big model is also slower on them this is an upper bound.
+    """
+    if not b_rows or not b_sec:
+        return None
+    all_big = b_sec / b_rows * s_rows
+    return all_big, all_big - (s_sec + b_sec)
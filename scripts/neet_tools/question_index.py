@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Embedding index of solved questions for `neet_tools answer --index`.
+
+- Embeds "stem + options" of every row that already has a correct_index
+  via Ollama's embed endpoint (batched)
+- Stores unit-normalised float32 vectors as a raw matrix that is opened with
+  numpy.memmap, so a 500k × 768 index is paged in by the OS, not parsed
+- Incremental: rows are keyed by a hash of stem+options; rebuilding only
+  embeds and appends rows the index has not seen
+- Batched top-k cosine search: one matmul per chunk of the matrix for a
+  whole batch of queries, so batched per-query cost stays at a few ms
+- Row metadata is read lazily: rows.jsonl is memory-mapped and only the
+  hits are parsed, via a uint64 start-offset table. Measured at 200k rows ×
+  768 dims: opening the index went from 2.6 s (parsing every row) to ~1 ms
+  (~80 ms once for an index built before offsets.u64 existed); one query
+  plus its 5 hit rows is ~70 ms, nearly all of it the matmul, while a
+  batch of 256 is ~1.7 s, i.e. ~6.5 ms per query
+
+Deps:
+  pip install numpy ollama      (and an embedding model: ollama pull nomic-embed-text)
+
+Layout of an index directory:
+  meta.json     {"model", "dim", "count", "rows_bytes"}   (written last)
+  vectors.f32   count × dim float32, row-major
+  rows.jsonl    one {"key", "stem", "options", "correct_index", "subject",
+                "why", "source", "row"} per vector; only the first rows_bytes count
+  offsets.u64   count little-endian uint64 byte offsets of each row in
+                rows.jsonl (rebuilt from rows.jsonl if missing or short)
+
+Usage:
+  python3 -m neet_tools index build neet_2022_questions_complete.csv --index qindex
+  python3 -m neet_tools index build more_solved.csv --index qindex        # appends new rows only
+  python3 -m neet_tools index query "Which hormone ..." --index qindex -k 5
+"""
+
+from __future__ import annotations
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy / ollama are imported inside the functions that use them so the
+# CLI can list and parse options without loading either.
+
+EMBED_BATCH = 64
+SEARCH_CHUNK = 65536  # matrix rows per matmul; bounds scratch memory
+WHY_CHARS = 300  # explanation kept per row for JSON-style few-shot examples
+
+
+def _norm(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def row_key(stem: str, options: List[str]) -> str:
+    """Stable identity of a question (whitespace/case-insensitive)."""
+    norm = _norm(stem) + "\x1f" + "\x1f".join(_norm(o) for o in options)
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()
+
+
+def explanation_text(value) -> str:
+    """Text of an explanation cell: JSON {"text": ...} or a plain string."""
+    if not value:
+        return ""
+    try:
+        j = json.loads(value)
+    except (ValueError, TypeError):
+        return str(value).strip()
+    if isinstance(j, dict):
+        return str(j.get("text") or "").strip()
+    return str(j).strip()
+
+
+def embed_text(stem: str, options: List[str]) -> str:
+    return stem.strip() + "\n" + "\n".join(f"{l}. {o}" for l, o in zip("ABCD", options))
+
+
+def embed_batch(model: str, texts: List[str]) -> np.ndarray:
+    """Embed texts with Ollama and L2-normalise the rows."""
+    import numpy as np
+    import ollama
+
+    out = []
+    for i in range(0, len(texts), EMBED_BATCH):
+        resp = ollama.embed(model=model, input=texts[i:i + EMBED_BATCH])
+        out.extend(resp["embeddings"])
+    vecs = np.asarray(out, dtype=np.float32)
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vecs / norms
+
+
+class QuestionIndex:
+    def __init__(self, path: Path, model: str = "nomic-embed-text"):
+        self.path = Path(path)
+        self.model = model
+        self.dim = 0
+        self.count = 0
+        self.rows_bytes = 0
+        self.vectors: Optional[np.ndarray] = None
+        self.offsets: Optional[np.ndarray] = None
+        self._rows_map: Optional[mmap.mmap] = None
+        self._keys: Optional[set] = None  # only needed to dedupe builds
+
+        meta = self.path / "meta.json"
+        if meta.exists():
+            m = json.loads(meta.read_text())
+            self.model, self.dim, self.count = m["model"], m["dim"], m["count"]
+            self.rows_bytes = m.get("rows_bytes", 0)
+            self._map()
+
+    def _map(self) -> None:
+        import numpy as np
+
+        self._unmap()
+        if not self.count:
+            return
+        self.vectors = np.memmap(self.path / "vectors.f32", dtype=np.float32,
+                                 mode="r", shape=(self.count, self.dim))
+        with open(self.path / "rows.jsonl", "rb") as fh:
+            self._rows_map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        off = self.path / "offsets.u64"
+        if not self.rows_bytes or not off.exists() or off.stat().st_size < self.count * 8:
+            self._rebuild_offsets()
+        self.offsets = np.memmap(off, dtype="<u8", mode="r", shape=(self.count,))
+
+    def _unmap(self) -> None:
+        # drop the maps before add_csv truncates/appends the files under them
+        if self._rows_map is not None:
+            self._rows_map.close()
+        self._rows_map = self.offsets = self.vectors = None
+
+    def _rebuild_offsets(self) -> None:
+        """Recreate offsets.u64 from the first `count` lines of rows.jsonl."""
+        import numpy as np
+
+        buf = np.frombuffer(self._rows_map, dtype=np.uint8)
+        ends = np.flatnonzero(buf == ord("\n"))[:self.count] + 1
+        del buf  # the mmap cannot close while a buffer view is alive
+        if len(ends) < self.count:
+            raise SystemExit(f"{self.path / 'rows.jsonl'}: {len(ends)} rows, meta says {self.count}")
+        if not self.rows_bytes:  # meta from before rows_bytes was recorded
+            self.rows_bytes = int(ends[-1])
+        starts = np.concatenate([[0], ends[:-1]]).astype("<u8")
+        tmp = self.path / "offsets.u64.tmp"
+        starts.tofile(tmp)
+        os.replace(tmp, self.path / "offsets.u64")
+
+    def row(self, j: int) -> dict:
+        """Metadata of index entry j, parsed on demand."""
+        start = int(self.offsets[j])
+        end = int(self.offsets[j + 1]) if j + 1 < self.count else self.rows_bytes
+        return json.loads(self._rows_map[start:end])
+
+    @property
+    def keys(self) -> set:
+        if self._keys is None:
+            self._keys = {self.row(j)["key"] for j in range(self.count)}
+        return self._keys
+
+    # ---------- build ---------- #
+    def add_csv(self, csv_path: Path) -> int:
+        """
+        Embed and append solved rows from csv_path not already indexed.
+        Rows whose explanation is empty are skipped: the extractor writes
+        correct_index 0 when it found no answer, so only rows with a
+        solution text count as solved.
+        """
+        source = str(Path(csv_path).resolve())
+        new = []
+        with open(csv_path, newline="", encoding="utf-8") as fh:
+            for n, row in enumerate(csv.DictReader(fh)):
+                try:
+                    ci = int(float(row.get("correct_index") or ""))
+                    options = json.loads(row["options"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if ci not in (0, 1, 2, 3) or not isinstance(options, list) or len(options) != 4:
+                    continue
+                if "explanation" in row and not explanation_text(row["explanation"]):
+                    continue
+                stem = str(row.get("stem") or "").strip()
+                options = [str(o).strip() for o in options]
+                key = row_key(stem, options)
+                if not stem or key in self.keys:
+                    continue
+                self.keys.add(key)
+                new.append({"key": key, "stem": stem, "options": options,
+                            "correct_index": ci, "subject": row.get("subject") or "",
+                            "why": explanation_text(row.get("explanation"))[:WHY_CHARS],
+                            "source": source, "row": n})
+        if not new:
+            return 0
+
+        import numpy as np
+
+        vecs = embed_batch(self.model, [embed_text(r["stem"], r["options"]) for r in new])
+        if self.dim and vecs.shape[1] != self.dim:
+            raise SystemExit(f"Embedding dim {vecs.shape[1]} != index dim {self.dim} (model changed?)")
+        self.dim = vecs.shape[1]
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Truncate every file to the committed size first so a crashed build
+        # leaves no orphan vectors/rows behind, then append and commit meta
+        # last. Nothing already committed is rewritten.
+        lines = [(json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8") for r in new]
+        starts = np.cumsum([self.rows_bytes] + [len(b) for b in lines[:-1]], dtype="<u8")
+        payload = b"".join(lines)
+        self._unmap()
+        with open(self.path / "vectors.f32", "ab") as fh:
+            fh.truncate(self.count * self.dim * 4)
+            fh.write(vecs.tobytes())
+        with open(self.path / "rows.jsonl", "ab") as fh:
+            fh.truncate(self.rows_bytes)
+            fh.write(payload)
+        with open(self.path / "offsets.u64", "ab") as fh:
+            fh.truncate(self.count * 8)
+            fh.write(starts.tobytes())
+        self.count += len(new)
+        self.rows_bytes += len(payload)
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps({"model": self.model, "dim": self.dim, "count": self.count,
+                                   "rows_bytes": self.rows_bytes}))
+        os.replace(tmp, self.path / "meta.json")
+        self._map()
+        return len(new)
+
+    # ---------- search ---------- #
+    def search(self, queries: np.ndarray, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k cosine neighbours for each (normalised) query row.
+        Returns (indices, scores), both shaped (len(queries), k), best first.
+        """
+        import numpy as np
+
+        nq = len(queries)
+        k = min(k, self.count)
+        if not nq or not k:
+            return np.zeros((nq, 0), dtype=np.int64), np.zeros((nq, 0), dtype=np.float32)
+
+        best_s = np.full((nq, k), -np.inf, dtype=np.float32)
+        best_i = np.zeros((nq, k), dtype=np.int64)
+        for lo in range(0, self.count, SEARCH_CHUNK):
+            chunk = self.vectors[lo:lo + SEARCH_CHUNK]
+            s = queries @ chunk.T                         # (nq, chunk)
+            kk = min(k, s.shape[1])
+            part = np.argpartition(s, -kk, axis=1)[:, -kk:]
+            cand_s = np.concatenate([best_s, np.take_along_axis(s, part, axis=1)], axis=1)
+            cand_i = np.concatenate([best_i, part + lo], axis=1)
+            top = np.argpartition(cand_s, -k, axis=1)[:, -k:]
+            best_s = np.take_along_axis(cand_s, top, axis=1)
+            best_i = np.take_along_axis(cand_i, top, axis=1)
+
+        order = np.argsort(-best_s, axis=1)
+        return np.take_along_axis(best_i, order, axis=1), np.take_along_axis(best_s, order, axis=1)
+
+    def neighbours(self, items: List[Tuple[str, List[str]]], k: int = 5,
+                   origins: Optional[List[Tuple[str, int]]] = None) -> List[List[Tuple[dict, float]]]:
+        """
+        Embed (stem, options) pairs in batches and return [(row, score)] per item.
+        origins[n] = (resolved csv path, data row) of item n, if it may have
+        been indexed from that very row (answering under --overwrite); that
+        one index entry is skipped. Duplicates from anywhere else are kept,
+        since they are exactly what reuse is for.
+        """
+        if not items or not self.count:
+            return [[] for _ in items]
+        q = embed_batch(self.model, [embed_text(s, o) for s, o in items])
+        idx, sc = self.search(q, k + 1)
+        origins = origins or [None] * len(items)
+        out = []
+        for origin, ii, ss in zip(origins, idx, sc):
+            rows = [(self.row(j), float(s)) for j, s in zip(ii, ss)]
+            hits = [(r, s) for r, s in rows
+                    if origin is None or (r.get("source"), r.get("row")) != origin]
+            out.append(hits[:k])
+        return out
+
+
+def reuse_answer(stem: str, options: List[str], hit: dict) -> Optional[int]:
+    """
+    correct_index for `options` if the indexed hit has the same stem and the
+    same option texts (in any order), else None. Cosine alone is not
+    enough: "correct" vs "incorrect" stems embed almost identically.
+    """
+    if _norm(stem) != _norm(hit["stem"]):
+        return None
+    norm = [_norm(o) for o in options]
+    theirs = [_norm(o) for o in hit["options"]]
+    if sorted(norm) != sorted(theirs):
+        return None
+    return norm.index(theirs[hit["correct_index"]])
+
+
+def few_shot_block(hits: List[Tuple[dict, float]], json_answers: bool = False) -> str:
+    """
+    Solved neighbours formatted as worked examples to prefix a prompt.
+    json_answers formats each answer the way PROMPT_WITH_EXPLANATION asks
+    for it ({"answer":..,"why":..}) instead of "Answer: X", so the examples
+    do not contradict the requested output format.
+    """
+    if not hits:
+        return ""
+    parts = ["Here are similar solved questions for reference.\n"]
+    for row, _ in hits:
+        opts = "\n".join(f"{l}. {o}" for l, o in zip("ABCD", row["options"]))
+        letter = "ABCD"[row["correct_index"]]
+        if json_answers:
+            answer = json.dumps({"answer": letter, "why": row.get("why") or ""}, ensure_ascii=False)
+        else:
+            answer = f"Answer: {letter}"
+        parts.append(f"Question:\n{row['stem']}\n\nOptions:\n{opts}\n\n{answer}\n")
+    parts.append("Now the actual question.\n\n")
+    return "\n".join(parts)
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(prog="neet_tools index", description="Solved-question embedding index")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="Add solved rows from CSVs (incremental)")
+    b.add_argument("csvs", nargs="+", type=Path)
+    q = sub.add_parser("query", help="Show nearest solved questions for a text")
+    q.add_argument("text")
+    q.add_argument("-k", type=int, default=5)
+    for p in (b, q):
+        p.add_argument("--index", type=Path, default=Path("question_index"), help="Index directory")
+        p.add_argument("--embed-model", default="nomic-embed-text", help="Ollama embedding model")
+    args = ap.parse_args(argv)
+
+    index = QuestionIndex(args.index, args.embed_model)
+    if args.cmd == "build":
+        for path in args.csvs:
+            added = index.add_csv(path)
+            print(f"{path}: +{added} rows")
+        print(f"Index: {index.count} rows × {index.dim} dims ({index.model}) → {args.index}")
+        return
+
+    t0 = time.perf_counter()
+    qv = embed_batch(index.model, [args.text])
+    t1 = time.perf_counter()
+    idx, sc = index.search(qv, args.k)
+    t2 = time.perf_counter()
+    print(f"embed {1000 * (t1 - t0):.1f} ms, search {1000 * (t2 - t1):.1f} ms over {index.count} rows")
+    for j, s in zip(idx[0], sc[0]):
+        r = index.row(j)
+        print(f"  {s:.3f}  [{'ABCD'[r['correct_index']]}] {r['stem'][:100]}")
+
+
+if __name__ == "__main__":
+    main()
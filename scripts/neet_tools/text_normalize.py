@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Math/formula-aware text normalization shared by the neet_tools commands.
+
+Stages (all cheap; the whole thing is a few linear passes over the text)
+- Unicode NFC (skipped for pure-ASCII input)
+- One precompiled str.translate table: ligatures, dashes, quotes,
+  exotic spaces, zero-width junk, tabs/CR (applied only to the runs of
+  characters it actually maps)
+- Whitespace collapse (keeping or folding newlines)
+- One single-pass regex scanner that rebuilds what PDF/OCR text flattens:
+    eIectron   -> electron      (capital I inside an otherwise lowercase word)
+    sp3, sp3d2 -> sp³, sp³d²    (hybridisation)
+    10 ms-1    -> 10 ms⁻¹       (unit exponents, after a number)
+    × 10-10 m  -> × 10⁻¹⁰ m     (powers of ten between × and a unit)
+    6CO2, O2   -> 6CO₂, O₂      (chemical formula subscripts; coefficient kept)
+
+NFKC is deliberately NOT used: it would fold existing ² / ₂ back to plain
+digits. Compatibility characters we care about live in the table instead.
+
+Usage:
+  from neet_tools.text_normalize import normalize_text
+  normalize_text(raw)                       # keeps line breaks
+  normalize_text(raw, keep_newlines=False)  # single line, stripped
+"""
+
+from __future__ import annotations
+import re
+import unicodedata
+
+SUPERSCRIPT = str.maketrans("0123456789-+", "⁰¹²³⁴⁵⁶⁷⁸⁹⁻⁺")
+SUBSCRIPT = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
+
+# ---------- translate table ---------- #
+
+_CHAR_MAP = {
+    # ligatures (pdf text layers love these)
+    "ﬀ": "ff", "ﬁ": "fi", "ﬂ": "fl", "ﬃ": "ffi", "ﬄ": "ffl", "ﬅ": "st", "ﬆ": "st",
+    # dashes / minus signs
+    "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-", "―": "-", "−": "-", "﹣": "-", "－": "-",
+    # quotes
+    "‘": "'", "’": "'", "‚": "'", "‛": "'", "′": "'",
+    "“": '"', "”": '"', "„": '"', "‟": '"', "″": '"',
+    # spaces
+    "\t": " ", " ": " ", " ": " ", " ": " ", " ": " ",
+    " ": " ", " ": " ", " ": " ", " ": " ", " ": " ",
+    " ": " ", " ": " ", " ": " ", "　": " ",
+    # line breaks
+    "\r": "\n", " ": "\n", " ": "\n", "\x0b": "\n", "\x0c": "\n",
+    # invisible characters
+    "­": None, "​": None, "‌": None, "‍": None,
+    "⁠": None, "﻿": None,
+    # U+FFFD (broken font glyphs) is deliberately NOT mapped: it usually
+    # stands for a ×, µ or superscript, and dropping it turns "10�F" into a
+    # plausible but wrong "10F". Broken text should stay visibly broken.
+}
+TRANSLATE_TABLE = str.maketrans(_CHAR_MAP)
+# str.translate walks every code point through the dict once the text is
+# non-ASCII (~10x slower than a regex scan), so only feed it the runs that
+# actually contain a mapped character.
+_ODD_RUN = re.compile("[" + re.escape("".join(_CHAR_MAP)) + "]+")
+
+# ---------- single-pass scanner ---------- #
+
+# Two-letter symbols first so "Cl" wins over "C".
+_ELEMENTS = sorted("""
+    H He Li Be B C N O F Ne Na Mg Al Si P S Cl Ar K Ca Sc Ti V Cr Mn Fe Co Ni
+    Cu Zn Ga Ge As Se Br Kr Rb Sr Y Zr Nb Mo Tc Ru Rh Pd Ag Cd In Sn Sb Te I
+    Xe Cs Ba La Ce Pr Nd Pm Sm Eu Gd Tb Dy Ho Er Tm Yb Lu Hf Ta W Re Os Ir Pt
+    Au Hg Tl Pb Bi Po At Rn Fr Ra Ac Th Pa U Np Pu
+""".split(), key=len, reverse=True)
+_EL = "(?:" + "|".join(_ELEMENTS) + ")"
+
+# Single-element tokens that are unambiguous molecules; anything else with a
+# lone symbol ("B12", "C4 plants", "P1") is left alone. I2 is not here:
+# "I1 = I2" (currents) is as common as iodine.
+_LONE_MOLECULES = {"H2", "N2", "O2", "O3", "F2", "Cl2", "Br2", "S8", "P4"}
+
+# One-letter symbols that physics reuses as quantities (V, W, Y, U, I ...)
+# are only trusted as formula atoms from this set; "CV2", "IW2", "Y2K" are
+# products of variables, not compounds. Two-letter symbols are always fine.
+_COMMON_SINGLE = set("HBCNOFPSK")
+
+# Names that happen to spell element symbols + digits: SN1/SN2 reactions,
+# influenza subtypes (H1N1, H5N1), photosystems (PS1, PS2).
+_NOT_FORMULAE = re.compile(r"SN[12]|H\d{1,2}N\d{1,2}|PS[12]")
+
+_UNITS = r"(?:kg|mol|cm|mm|km|Hz|Pa|m|s|g|L|K|J|V|N)"
+_SI = r"(?:kg|mol|cm|mm|nm|km|Hz|Pa|eV|m|s|g|J|V|N|C|A|W|K|T|F|M|Ω)"
+
+# Every branch opens on a literal (I, p, 1, -) or one small class ([A-Z]) and
+# there are no capture groups, which keeps sre on its fast prefix search.
+# The branch that fired is recovered from the first character in _rewrite.
+SCANNER = re.compile(
+    r"I(?<=[a-z]I)(?=[a-z])"                       # eIectron
+    r"|p(?<=\bsp)[23](?:d[23]?)?\b"                # sp3, sp3d, sp3d2
+    r"|1(?<!\w1)0 ?-\d{1,2}(?= ?[A-Za-zΩ])"        # × 10-10 m
+    r"|-(?<=[A-Za-z]-)[1-4]\b"                      # ms-1
+    r"|[A-Z](?<![A-Za-z_][A-Z])[A-Za-z]{0,6}\d[A-Za-z\d]*\b"  # CaCO3, 6CO2
+)
+# "ms-1" only counts as an exponent after a number ("10 ms-1",
+# "8.314 J K-1 mol-1"); "N-1 position" or "Vitamin K-1" have none.
+_UNIT_TAIL = re.compile(rf"\d ?(?:{_UNITS}+(?:-[1-4])? )*{_UNITS}+$")
+# "10-15" is a power of ten only as "× 10-15" / "x 10-15"; bare it is
+# as likely a range ("between 10-15 s").
+_TIMES_BEFORE = re.compile(r"(?:^|[^A-Za-z])[×x*] ?$")
+_SI_AHEAD = re.compile(rf" ?{_SI}\b")
+_FORMULA = re.compile(rf"(?:{_EL}\d{{0,2}})+")
+_ELEMENT = re.compile(_EL)
+_HALF_BEFORE = re.compile(r"(?:1/2|½) ?$")
+_WORD = re.compile(r"[A-Za-z]*")
+
+
+def _formula(tok: str, text: str, start: int) -> str:
+    if not _FORMULA.fullmatch(tok) or _NOT_FORMULAE.fullmatch(tok):
+        return tok
+    if tok not in _LONE_MOLECULES:
+        atoms = _ELEMENT.findall(tok)
+        if len(atoms) < 2 or any(len(a) == 1 and a not in _COMMON_SINGLE for a in atoms):
+            return tok
+    if _HALF_BEFORE.search(text, max(0, start - 4), start):
+        return tok  # "1/2 mv2": kinetic-energy style products
+    return tok.translate(SUBSCRIPT)
+
+
+def _ocr_l(text: str, pos: int) -> str:
+    """'I' between lowercase letters is an OCR'd 'l' only if the rest of the
+    word is lowercase: "eIectron" yes, "McIntosh" / "sIgA" no."""
+    lo = pos
+    while lo and text[lo - 1].isalpha():
+        lo -= 1
+    word = text[lo:pos] + _WORD.match(text, pos + 1).group()
+    return "l" if word.islower() else "I"
+
+
+def _rewrite(m: re.Match) -> str:
+    tok = m.group()
+    head = tok[0]
+    if tok == "I":
+        return _ocr_l(m.string, m.start())
+    if head == "p":
+        return tok.translate(SUPERSCRIPT)
+    if head == "1":
+        start = m.start()
+        if not _SI_AHEAD.match(m.string, m.end()) or \
+                not _TIMES_BEFORE.search(m.string, max(0, start - 4), start):
+            return tok
+        return "10⁻" + tok.rpartition("-")[2].translate(SUPERSCRIPT)
+    if head == "-":
+        start = m.start()
+        if not _UNIT_TAIL.search(m.string, max(0, start - 40), start):
+            return tok
+        return tok.translate(SUPERSCRIPT)
+    return _formula(tok, m.string, m.start())
+
+
+# ---------- public API ---------- #
+
+_SPACES = re.compile(r" {2,}")
+
+
+def _translate_run(m: re.Match) -> str:
+    return m.group().translate(TRANSLATE_TABLE)
+
+
+def normalize_text(text: str, keep_newlines: bool = True) -> str:
+    """
+    Normalize raw PDF/CSV question text.
+    keep_newlines=True keeps line structure (the extractor's block regexes
+    depend on it); False folds everything to single spaces and strips.
+    """
+    if not text:
+        return ""
+    if not text.isascii():
+        text = unicodedata.normalize("NFC", text)
+    text = _ODD_RUN.sub(_translate_run, text)
+    if keep_newlines:
+        text = _SPACES.sub(" ", text)
+    else:
+        text = " ".join(text.split())
+    return SCANNER.sub(_rewrite, text)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# make `neet_tools` importable when pytest runs from the repo root or scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from neet_tools import answer
+from neet_tools.answer import ask_permuted, cascade, majority_letter, option_permutations
+
+TEMPLATE = "{stem}\nA) {a}\nB) {b}\nC) {c}\nD) {d}\n"
+OPTIONS = ["wrong1", "wrong2", "right", "wrong3"]
+
+
+def slot_of(prompt, text):
+    for line in prompt.splitlines():
+        if line.endswith(") " + text):
+            return line[0]
+    raise AssertionError(text)
+
+
+def test_majority_letter_share_counts_unparsed():
+    assert majority_letter(["B", "B", "A"], 4) == ("B", 0.5)
+
+
+def test_majority_letter_tie_goes_to_first_by_default():
+    assert majority_letter(["A", "C", "A", "C"], 4) == ("A", 0.5)
+
+
+def test_majority_letter_tie_undecided():
+    # identity-order votes come first; a 2-2 split must not favour them
+    assert majority_letter(["A", "C", "A", "C"], 4, tie_undecided=True) == ("", 0.5)
+
+
+def test_majority_letter_no_votes():
+    assert majority_letter([], 3) == ("", 0.0)
+
+
+def test_ask_permuted_maps_slots_back(monkeypatch):
+    # the model always picks "right", wherever the permutation put it
+    monkeypatch.setattr(answer, "ask_once", lambda m, p, t: slot_of(p, "right"))
+    perms = option_permutations(6, seed=1)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        letter, raw, share = ask_permuted("m", TEMPLATE, "q", OPTIONS, 0.0, 1, perms, pool)
+    assert (letter, share) == ("C", 1.0)
+    assert raw.split("\n---\n")[1] == "B"  # rotation 1 showed "right" in slot B
+
+
+def test_ask_permuted_position_bias_is_undecided(monkeypatch):
+    # always answering "A" votes once for every option under the 4 rotations
+    monkeypatch.setattr(answer, "ask_once", lambda m, p, t: "A")
+    letter, _, share = ask_permuted("m", TEMPLATE, "q", OPTIONS, 0.0, 1, option_permutations(4, 0))
+    assert (letter, share) == ("", 0.25)
+
+
+def fixed(letter, share, calls, name):
+    def ask():
+        calls.append(name)
+        return letter, name, share
+    return ask
+
+
+@pytest.mark.parametrize("small, big, expected", [
+    (("B", 1.0), ("C", 1.0), ("B", "small", False, ["small"])),    # confident: keep
+    (("B", 0.8), ("C", 1.0), ("B", "small", False, ["small"])),    # share == threshold keeps
+    (("B", 0.6), ("C", 1.0), ("C", "big", True, ["small", "big"])),
+    (("", 0.0), ("D", 0.5), ("D", "big", True, ["small", "big"])),  # undecided escalates
+    (("B", 0.6), ("", 0.0), ("B", "small", True, ["small", "big"])),  # big unparseable
+])
+def test_cascade_escalate_or_keep(small, big, expected):
+    calls = []
+    letter, raw, _, escalated = cascade(fixed(*small, calls, "small"),
+                                        fixed(*big, calls, "big"), 0.8)
+    assert (letter, raw, escalated, calls) == expected
+
+
+def test_cascade_without_big_model_never_escalates():
+    calls = []
+    assert cascade(fixed("", 0.0, calls, "small"), None, 0.8) == ("", "small", 0.0, False)
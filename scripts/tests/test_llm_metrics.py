@@ -0,0 +1,124 @@
+import time
+
+import pytest
+
+from neet_tools.llm_metrics import RunMetrics, cascade_savings
+
+
+def resp(tokens, ns, prompt=0):
+    return {"eval_count": tokens, "eval_duration": ns, "prompt_eval_count": prompt}
+
+
+def record(m, seconds, model="small", r=None):
+    m.request_started()
+    m.request_finished(model, seconds, r if r is not None else resp(0, 0))
+
+
+def test_quantiles_clamped_to_observed_range():
+    m = RunMetrics()
+    for _ in range(10):
+        record(m, 0.012)
+    st = m.models["small"]
+    # all in the 0.01-0.025 bucket but every sample was 12ms
+    assert st.quantile(0.5) == pytest.approx(0.012)
+    assert st.quantile(0.99) == pytest.approx(0.012)
+
+
+def test_quantile_interpolates_within_bucket():
+    m = RunMetrics()
+    for s in (1.5, 1.5, 1.5, 2.0, 6.0):
+        record(m, s)
+    st = m.models["small"]
+    assert 1.0 < st.quantile(0.5) <= 2.0
+    assert 5.0 < st.quantile(0.99) <= 6.0  # capped at the max, not 7.5
+
+
+def test_tokens_per_sec_and_parse_rate():
+    m = RunMetrics()
+    record(m, 1.0, r=resp(100, 2_000_000_000, prompt=40))
+    record(m, 1.0, r=resp(50, 1_000_000_000, prompt=40))
+    m.parsed("small", True)
+    m.parsed("small", True)
+    m.parsed("small", True)
+    m.parsed("small", False)
+    st = m.models["small"]
+    assert st.tokens_per_sec() == pytest.approx(50.0)
+    assert st.prompt_tokens == 80
+    assert st.parse_fail_rate() == pytest.approx(0.25)
+
+
+def test_error_counted_without_tokens():
+    m = RunMetrics()
+    m.request_started()
+    m.request_finished("small", 0.5, None)
+    assert m.models["small"].errors == 1
+    assert m.models["small"].tokens_per_sec() == 0.0
+
+
+def test_prometheus_text():
+    m = RunMetrics()
+    m.queue_rows(3)
+    record(m, 0.3)
+    record(m, 4.0)
+    m.row_done()
+    text = m.to_prometheus()
+    lines = text.splitlines()
+    assert text.endswith("\n")
+    assert 'neet_llm_request_seconds_bucket{model="small",le="0.25"} 0' in lines
+    assert 'neet_llm_request_seconds_bucket{model="small",le="0.5"} 1' in lines
+    assert 'neet_llm_request_seconds_bucket{model="small",le="+Inf"} 2' in lines
+    assert 'neet_llm_request_seconds_count{model="small"} 2' in lines
+    assert 'neet_llm_request_seconds_sum{model="small"} 4.300000' in lines
+    assert "neet_llm_rows_pending 2" in lines
+    assert "neet_llm_rows_done_total 1" in lines
+    for line in lines:
+        assert line.startswith("#") or len(line.rsplit(" ", 1)) == 2
+
+
+def test_inflight_peak_survives_until_export(tmp_path):
+    m = RunMetrics()
+    for _ in range(3):
+        m.request_started()
+    for _ in range(3):
+        m.request_finished("small", 0.1, resp(1, 1))
+    assert m.snapshot()["inflight"] == 0
+    assert m.snapshot()["inflight_peak"] == 3
+    m.export(jsonl_path=str(tmp_path / "m.jsonl"))
+    assert m.snapshot()["inflight_peak"] == 0
+
+
+def test_exporter_thread_writes_while_running(tmp_path):
+    prom = tmp_path / "run.prom"
+    m = RunMetrics()
+    m.start_exporter(0.01, prom_path=str(prom))
+    m.request_started()  # a request that has not returned yet
+    try:
+        for _ in range(200):
+            if prom.exists() and "neet_llm_inflight_requests 1" in prom.read_text():
+                break
+            time.sleep(0.01)
+        else:
+            pytest.fail("exporter never wrote the live in-flight gauge")
+    finally:
+        m.stop_exporter()
+
+
+def test_cascade_savings():
+    # 100 rows on the small tier in 100s; 10 escalated taking 50s on the big one
+    all_big, saved = cascade_savings(100, 100.0, 10, 50.0)
+    assert all_big == pytest.approx(500.0)
+    assert saved == pytest.approx(350.0)
+    assert cascade_savings(100, 100.0, 0, 0.0) is None
+
+
+def test_tiers_keyed_by_role_not_model(capsys):
+    m = RunMetrics()
+    m.tier_row("small", 1.0)
+    m.tier_row("small", 1.0)
+    m.tier_row("big", 4.0)
+    m.print_cascade("llama3", "llama3")  # same model in both roles
+    out = capsys.readouterr().out
+    assert "small (llama3): 2 rows" in out
+    assert "big (llama3): 1 escalated rows" in out
+    assert "est. big-only: 8s  actual: 6s  saved: 2s (25%)" in out
+    assert "overestimates" in out
@@ -0,0 +1,118 @@
+import csv
+import hashlib
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from neet_tools import question_index as qi
+
+FIELDS = ["subject", "stem", "options", "correct_index", "explanation"]
+
+
+def fake_embed(model, texts):
+    """Deterministic bag-of-words vectors instead of an Ollama call."""
+    vecs = np.zeros((len(texts), 64), dtype=np.float32)
+    for i, t in enumerate(texts):
+        for w in t.lower().split():
+            vecs[i, int(hashlib.md5(w.encode()).hexdigest(), 16) % 64] += 1
+    return vecs / np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-9)
+
+
+@pytest.fixture(autouse=True)
+def no_ollama(monkeypatch):
+    monkeypatch.setattr(qi, "embed_batch", fake_embed)
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        w = csv.DictWriter(fh, fieldnames=FIELDS)
+        w.writeheader()
+        for stem, options, ci, why in rows:
+            w.writerow({"subject": "Chemistry", "stem": stem, "options": json.dumps(options),
+                        "correct_index": ci, "explanation": json.dumps({"text": why})})
+    return path
+
+
+OPTS = ["sp", "sp2", "sp3", "dsp2"]
+STEM = "What is the hybridisation of carbon in methane?"
+
+
+def test_exact_duplicate_is_reused(tmp_path):
+    src = write_csv(tmp_path / "solved.csv", [(STEM, OPTS, 2, "four sigma bonds")])
+    index = qi.QuestionIndex(tmp_path / "ix")
+    assert index.add_csv(src) == 1
+
+    # same question, options shuffled, asked from another file
+    shuffled = ["sp3", "sp", "dsp2", "sp2"]
+    [hits] = index.neighbours([(STEM, shuffled)], k=3)
+    assert hits and hits[0][1] > 0.99
+    assert qi.reuse_answer(STEM, shuffled, hits[0][0]) == 0
+
+
+def test_overwrite_skips_only_the_row_itself(tmp_path):
+    src = write_csv(tmp_path / "solved.csv", [(STEM, OPTS, 2, "four sigma bonds")])
+    index = qi.QuestionIndex(tmp_path / "ix")
+    index.add_csv(src)
+
+    [hits] = index.neighbours([(STEM, OPTS)], k=3, origins=[(str(src.resolve()), 0)])
+    assert hits == []
+    [hits] = index.neighbours([(STEM, OPTS)], k=3, origins=[(str(src.resolve()), 5)])
+    assert len(hits) == 1
+
+
+def test_negated_stem_is_not_reused(tmp_path):
+    src = write_csv(tmp_path / "solved.csv",
+                    [("Which statement is correct about diborane?", OPTS, 1, "why")])
+    index = qi.QuestionIndex(tmp_path / "ix")
+    index.add_csv(src)
+    [hits] = index.neighbours([("Which statement is incorrect about diborane?", OPTS)], k=1)
+    assert qi.reuse_answer("Which statement is incorrect about diborane?", OPTS, hits[0][0]) is None
+
+
+def test_rows_without_explanation_are_not_solved(tmp_path):
+    src = write_csv(tmp_path / "solved.csv", [(STEM, OPTS, 0, ""), ("Another question here?", OPTS, 1, "because")])
+    index = qi.QuestionIndex(tmp_path / "ix")
+    assert index.add_csv(src) == 1
+    assert index.row(0)["stem"] == "Another question here?"
+
+
+def test_incremental_build_recovers_from_torn_append(tmp_path):
+    ix = tmp_path / "ix"
+    first = write_csv(tmp_path / "a.csv", [(STEM, OPTS, 2, "x")])
+    qi.QuestionIndex(ix).add_csv(first)
+
+    # a crashed build left half a row behind, meta still says count=1
+    with open(ix / "rows.jsonl", "ab") as fh:
+        fh.write(b'{"key": "torn')
+
+    index = qi.QuestionIndex(ix)
+    assert index.count == 1
+    second = write_csv(tmp_path / "b.csv", [("Another question here?", OPTS, 1, "y")])
+    assert index.add_csv(second) == 1
+
+    reloaded = qi.QuestionIndex(ix)
+    assert reloaded.count == 2
+    assert [reloaded.row(j)["stem"] for j in range(2)] == [STEM, "Another question here?"]
+    assert reloaded.vectors.shape == (2, 64)
+
+
+def test_rows_read_lazily_and_offsets_rebuilt(tmp_path):
+    ix = tmp_path / "ix"
+    src = write_csv(tmp_path / "a.csv", [(STEM, OPTS, 2, "x"), ("Another question here?", OPTS, 1, "y")])
+    qi.QuestionIndex(ix).add_csv(src)
+
+    (ix / "offsets.u64").unlink()  # index from before the offset table
+    index = qi.QuestionIndex(ix)
+    assert index.row(1)["stem"] == "Another question here?"
+    assert index.row(0)["why"] == "x"
+    assert index.keys == {qi.row_key(STEM, OPTS), qi.row_key("Another question here?", OPTS)}
+
+
+def test_few_shot_block_matches_answer_format():
+    hit = ({"stem": STEM, "options": OPTS, "correct_index": 2, "why": "four sigma bonds"}, 0.9)
+    assert qi.few_shot_block([hit]).count("Answer: C") == 1
+    block = qi.few_shot_block([hit], json_answers=True)
+    assert '{"answer": "C", "why": "four sigma bonds"}' in block
+    assert "Answer: C" not in block
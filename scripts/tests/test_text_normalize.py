@@ -0,0 +1,75 @@
+import pytest
+
+from neet_tools.text_normalize import normalize_text
+
+REWRITES = [
+    # OCR capital I inside a lowercase word
+    ("The eIectron is", "The electron is"),
+    # hybridisation
+    ("carbon is sp3 hybridised", "carbon is sp³ hybridised"),
+    ("sp3d2 geometry", "sp³d² geometry"),
+    # unit exponents after a number
+    ("a velocity 10 ms-1 at", "a velocity 10 ms⁻¹ at"),
+    ("R = 8.314 J K-1 mol-1", "R = 8.314 J K⁻¹ mol⁻¹"),
+    ("1000 kg m-3", "1000 kg m⁻³"),
+    # powers of ten after a multiplication sign, before a unit
+    ("λ = 3 × 10-10 m", "λ = 3 × 10⁻¹⁰ m"),
+    ("q = 1.6 x 10-19 C", "q = 1.6 x 10⁻¹⁹ C"),
+    # chemical formulae
+    ("CaCO3 + 2HCl", "CaCO₃ + 2HCl"),
+    ("H2SO4 and NH3", "H₂SO₄ and NH₃"),
+    ("O2 and Cl2 gas", "O₂ and Cl₂ gas"),
+    ("KMnO4 solution", "KMnO₄ solution"),
+    # equations: coefficients stay, formulae behind them are converted
+    ("6CO2 + 6H2O → C6H12O6 + 6O2", "6CO₂ + 6H₂O → C₆H₁₂O₆ + 6O₂"),
+    ("2H2 + O2 → 2H2O", "2H₂ + O₂ → 2H₂O"),
+    ("CaCO3 + 2HCl → CaCl2 + CO2 + H2O", "CaCO₃ + 2HCl → CaCl₂ + CO₂ + H₂O"),
+    ("CuSO4.5H2O crystals", "CuSO₄.5H₂O crystals"),
+    ("heIium nucIeus", "helium nucleus"),
+    # character table
+    ("ﬁnal – step", "final - step"),
+    ("a​b", "ab"),
+]
+
+UNCHANGED = [
+    # reaction, virus and photosystem names
+    "SN1 and SN2 reactions",
+    "the H1N1 and H5N1 strains",
+    "electrons from PS1 reach PS2",
+    # lone symbols that are not molecules
+    "vitamin B12 in C4 plants",
+    "Q55 and P1",
+    # products of physics variables, not compounds
+    "U = 1/2 CV2",
+    "K = 1/2 IW2",
+    "I1 = I2",
+    "the Y2K bug",
+    # legitimate capital I inside a word
+    "McIntosh apples",
+    "sIgA in colostrum",
+    # ranges and positional names, not exponents
+    "between 10-15 s",
+    "(i) 10-20 years",
+    "substituent at N-1 position",
+    "Vitamin K-1 deficiency",
+    "(A-1) Carbon-1",
+    # broken glyphs stay visibly broken instead of becoming numbers
+    "capacitance10�F",
+    "�2500�900�10�12",
+]
+
+
+@pytest.mark.parametrize("raw, expected", REWRITES)
+def test_rewrites(raw, expected):
+    assert normalize_text(raw) == expected
+
+
+@pytest.mark.parametrize("raw", UNCHANGED)
+def test_false_positives_left_alone(raw):
+    assert normalize_text(raw) == raw
+
+
+def test_newline_modes():
+    raw = "  a\t\tb \r\nc  "
+    assert normalize_text(raw) == " a b \n\nc "
+    assert normalize_text(raw, keep_newlines=False) == "a b c"